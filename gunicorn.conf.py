@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for Setter.AI
+====================================
+
+Run with: gunicorn -c gunicorn.conf.py
+"""
+
+wsgi_app = "setter_ai.web.app:create_app()"
+pythonpath = "src"
+bind = "0.0.0.0:5000"
+
+# A single process: call tracking, the GHL poller and the lead monitor are
+# in-process state. Threads share it and read SQLite concurrently under WAL
+workers = 1
+worker_class = "gthread"
+threads = 16
+timeout = 60
@@ -9,10 +9,23 @@ __version__ = "1.0.0"
 __author__ = "Setter.AI Team"
 __description__ = "AI-Powered Lead Calling System with Professional Voice"
 
-from .core.ai_logic import AILogic
-from .integrations.ghl_integration import GHLIntegration
-from .integrations.twilio_integration import TwilioIntegration
-from .web.app import create_app
+# Public names are imported lazily (PEP 562) so `import setter_ai` doesn't
+# pull in openai, twilio, requests and Flask until they are used
+_LAZY_IMPORTS = {
+    'AILogic': '.core.ai_logic',
+    'GHLIntegration': '.integrations.ghl_integration',
+    'TwilioIntegration': '.integrations.twilio_integration',
+    'create_app': '.web.app'
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'AILogic',
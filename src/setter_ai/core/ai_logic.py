@@ -4,13 +4,120 @@ AI Logic Module
 Handles all AI conversation generation and response logic
 """
 
+import asyncio
+import bisect
+import contextlib
+import functools
 import json
 import logging
-import openai
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from itertools import islice
 from datetime import datetime
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Keywords for conversation outcome analysis
+POSITIVE_KEYWORDS = frozenset([
+    'interested', 'yes', 'sure', 'okay', 'good', 'great', 'perfect',
+    'meeting', 'schedule', 'tomorrow', 'call back', 'definitely',
+    'absolutely', 'of course', 'sounds good', 'that works'
+])
+
+NEGATIVE_KEYWORDS = frozenset([
+    'not interested', 'no thanks', 'busy', 'not now', 'later',
+    'not available', 'don\'t call', 'stop calling',
+    'no time', 'too busy', 'maybe later'
+])
+
+MEETING_KEYWORDS = frozenset([
+    'meeting', 'schedule', 'tomorrow', '3 p.m.', '3 pm', 'appointment',
+    'call back', 'follow up', 'set up', 'book'
+])
+
+def _compile_keywords(keywords):
+    """Compile a keyword set into a single substring-matching regex"""
+    return re.compile('|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+_POSITIVE_RE = _compile_keywords(POSITIVE_KEYWORDS)
+_NEGATIVE_RE = _compile_keywords(NEGATIVE_KEYWORDS)
+_MEETING_RE = _compile_keywords(MEETING_KEYWORDS)
+
+# Meeting detail extraction: one pass finds any time mention ("3 pm",
+# "3:00", "o'clock", "tomorrow", "next week", ...)
+_TIME_RE = re.compile(
+    r"\b(?:\d{1,2}(?::\d{2})?\s*[ap]\.?m\.?|\d{1,2}:\d{2}|o'?clock|hours?|today|tomorrow|(?:next|this)\s+week)(?!\w)",
+    re.IGNORECASE
+)
+_CONFIRMATION_RE = _compile_keywords(['tomorrow', '3 p.m.', '3 pm', 'schedule', 'meeting'])
+
+# Canonical meeting times for agent confirmations, in priority order
+_CANONICAL_TIMES = (
+    ('3 p.m.', '3:00 PM MST'),
+    ('3 pm', '3:00 PM MST'),
+    ('tomorrow', 'Tomorrow (Time TBD)')
+)
+
+# Sentence boundary used to flush streamed tokens to speech
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _normalize_time_span(span):
+    """Normalize a _TIME_RE match for canonical lookups ("3  pm." -> "3 pm", "3 p.m." kept)"""
+    span = ' '.join(span.split())
+    # The optional trailing dot also swallows a sentence-ending period
+    if span.endswith('.') and '.' not in span[:-1]:
+        span = span[:-1]
+    return span
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9\s]+')
+
+def _normalize_utterance(text):
+    """Normalize an utterance for response cache lookups"""
+    return ' '.join(_NON_WORD_RE.sub('', text.lower()).split())
+
+def _mask_name(text, lead_info):
+    """Replace a lead's full, first and last name in text with a placeholder"""
+    first = lead_info.get('firstName', '')
+    last = lead_info.get('lastName', '')
+    for name in (f"{first} {last}".strip(), first, last):
+        if name:
+            text = text.replace(name, '{lead_name}')
+    return text
+
+def _iso(ns):
+    """Format a time.time_ns() timestamp as ISO 8601"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+def _classify_outcome(positive_response, negative_response, meeting_scheduled):
+    """Determine the call outcome from keyword analysis"""
+    if positive_response and meeting_scheduled:
+        return 'positive_meeting'
+    elif positive_response:
+        return 'positive'
+    elif negative_response:
+        return 'negative'
+    return 'neutral'
+
+def _join_segments(segments):
+    """Join text segments with a unit separator, returning the buffer and each segment's end offset"""
+    parts = []
+    ends = []
+    pos = 0
+    for segment in segments:
+        parts.append(segment)
+        pos += len(segment)
+        ends.append(pos)
+        pos += 1
+    return '\x1f'.join(parts), ends
+
+def _segments_with_match(pattern, blob, ends):
+    """Indexes of the segments in which a keyword pattern matches"""
+    return {bisect.bisect_right(ends, match.start()) for match in pattern.finditer(blob)}
+
 class AILogic:
     """AI conversation logic class"""
     
@@ -20,10 +127,21 @@ class AILogic:
         self.ai_config = config.get('ai_settings', {})
         self.openai_api_key = config.get('openai', {}).get('api_key')
         
-        # Initialize OpenAI
+        # Initialize OpenAI (async v1 client over a pooled, keep-alive HTTP/2 connection)
         if self.openai_api_key:
-            openai.api_key = self.openai_api_key
+            # Deferred: openai/httpx are heavy and only needed once a key is configured
+            import httpx
+            import openai
+            
+            self.client = openai.AsyncOpenAI(
+                api_key=self.openai_api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                )
+            )
         else:
+            self.client = None
             logger.warning("OpenAI API key not configured")
         
         # AI settings
@@ -31,6 +149,7 @@ class AILogic:
         self.max_tokens = self.ai_config.get('max_tokens', 150)
         self.temperature = self.ai_config.get('temperature', 0.7)
         self.conversation_memory_turns = self.ai_config.get('conversation_memory_turns', 5)
+        self._maxmsgs = self.conversation_memory_turns * 2
         
         # Agent settings
         self.agent_name = self.ai_config.get('agent_name', 'Maayaa')
@@ -38,67 +157,141 @@ class AILogic:
         self.contact_person = self.ai_config.get('contact_person', 'Ryan')
         self.contact_email = self.ai_config.get('contact_email', 'ryan@loancater.com')
         
-        # Conversation memory
-        self.conversation_memory = {}
+        # Prompt templates; the scheduling prompt is cached per lead_name
+        self._build_prompt_templates()
+        self._render_prompt = functools.lru_cache(maxsize=256)(self._render_prompt_uncached)
+        
+        # Exact-match response cache for the lead-independent qualification stage,
+        # keyed on (name-free last agent turn, normalized utterance)
+        self.response_cache_size = self.ai_config.get('response_cache_size', 1024)
+        self._response_cache = OrderedDict()
+        
+        # Full per-call transcripts (the prompt window is applied in _build_messages),
+        # expiring abandoned calls an hour after last update;
+        # _mem_lock guards the cache itself (TTLCache is not thread-safe), per-call
+        # locks serialize appends and per-call turn locks serialize whole AI turns
+        self.conversation_memory = TTLCache(maxsize=10000, ttl=3600)
+        self._mem_lock = threading.Lock()
+        self._locks = weakref.WeakValueDictionary()
+        self._turn_locks = weakref.WeakValueDictionary()
     
-    def generate_response(self, lead_info, context="", call_id=""):
+    async def generate_response(self, lead_info, context="", call_id=""):
         """Generate AI response based on conversation context"""
         try:
-            lead_name = f"{lead_info.get('firstName', '')} {lead_info.get('lastName', '')}".strip()
-            conversation_history = self.conversation_memory.get(call_id, [])
-            conversation_length = len(conversation_history)
+            # One turn at a time per call so concurrent webhooks don't both hit OpenAI
+            async with self._turn_lock_for(call_id) if call_id else contextlib.nullcontext():
+                sentences = [sentence async for sentence in self.stream_response(lead_info, context, call_id)]
+            return ' '.join(sentences)
             
+        except Exception as e:
+            logger.error(f"Error generating AI response: {str(e)}")
+            return "I apologize, but I'm having trouble processing that right now. Could you please repeat?"
+    
+    async def stream_response(self, lead_info, context="", call_id=""):
+        """Stream AI response sentence by sentence as tokens arrive"""
+        lead_name = f"{lead_info.get('firstName', '')} {lead_info.get('lastName', '')}".strip()
+        conversation_history = self._get_history(call_id)
+        conversation_length = len(conversation_history)
+        
+        if conversation_length == 0:
+            # The opening greeting is fixed wording, so skip the OpenAI round-trip
+            cached_response = self._greeting(lead_name)
+        else:
             # Build system prompt based on conversation stage
             system_prompt = self._build_system_prompt(lead_name, conversation_length)
             
+            # Serve repeated qualification replies from the response cache, shared
+            # across leads; the agent's last turn (with the lead's name masked) is part
+            # of the key so a bare "yes" only reuses a reply to the same question.
+            # Scheduling replies are lead-specific and never cached
+            cache_key = None
+            cached_response = None
+            if system_prompt is self._tpl_qual:
+                last_turn = self._last_agent_turn(conversation_history)
+                cache_key = (_mask_name(last_turn, lead_info), _normalize_utterance(context))
+                cached_response = self._response_cache.get(cache_key)
+                if cached_response is not None:
+                    self._response_cache.move_to_end(cache_key)
+        
+        if cached_response is not None:
+            ai_response = cached_response
+            for sentence in _SENTENCE_END_RE.split(ai_response):
+                if sentence.strip():
+                    yield sentence.strip()
+        else:
+            if not self.client:
+                raise RuntimeError("OpenAI client not initialized")
+            
             # Build conversation context
             messages = self._build_messages(system_prompt, context, conversation_history)
             
-            # Generate response
-            response = openai.ChatCompletion.create(
+            # Stream response tokens, flushing on sentence boundaries
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                stream=True
             )
             
-            ai_response = response.choices[0].message.content.strip()
-            
-            # Store in conversation memory
-            if call_id:
-                if call_id not in self.conversation_memory:
-                    self.conversation_memory[call_id] = []
+            tokens = []
+            buffer = ''
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if not token:
+                    continue
                 
-                self.conversation_memory[call_id].append({
-                    'speaker': self.agent_name,
-                    'content': ai_response,
-                    'timestamp': datetime.now().isoformat()
-                })
+                tokens.append(token)
+                buffer += token
+                *sentences, buffer = _SENTENCE_END_RE.split(buffer)
+                for sentence in sentences:
+                    if sentence.strip():
+                        yield sentence.strip()
             
-            logger.info(f"Generated AI response for {lead_name}: {ai_response[:50]}...")
-            return ai_response
+            if buffer.strip():
+                yield buffer.strip()
             
-        except Exception as e:
-            logger.error(f"Error generating AI response: {str(e)}")
-            return "I apologize, but I'm having trouble processing that right now. Could you please repeat?"
+            ai_response = ''.join(tokens).strip()
+            self._cache_response(cache_key, ai_response, lead_info)
+        
+        # Store in conversation memory
+        self._append_message(call_id, self.agent_name, ai_response)
+        
+        logger.info(f"Generated AI response for {lead_name}: {ai_response[:50]}...")
     
-    def _build_system_prompt(self, lead_name, conversation_length):
-        """Build system prompt based on conversation stage"""
-        if conversation_length == 0:
-            # Initial greeting
-            return f"""You are {self.agent_name}, calling on behalf of {self.contact_person} from {self.company_name}.
-            
-            Start with a brief, warm introduction: "Hi {lead_name}, this is {self.agent_name} calling on behalf of {self.contact_person} from {self.company_name}."
-            Then ask if they have a quick moment to discuss business financing.
-            
-            Keep it short and natural - like a real person talking.
-            Don't give long speeches. Just introduce yourself and ask for their time.
-            Speak quickly and efficiently - no gaps or delays.
-            Respond immediately without hesitation."""
+    def _last_agent_turn(self, conversation_history):
+        """Get the agent's most recent message in a conversation (empty if none)"""
+        for msg in reversed(conversation_history):
+            if msg['speaker'] == self.agent_name:
+                return msg['content']
+        return ''
+    
+    def _cache_response(self, cache_key, ai_response, lead_info):
+        """Store a response in the bounded LRU response cache"""
+        if cache_key is None or self.response_cache_size <= 0 or not ai_response:
+            return
+        
+        # A reply that addresses the caller by name can't be replayed to other leads
+        if _mask_name(ai_response, lead_info) != ai_response:
+            return
         
-        elif conversation_length <= 2:
-            # Qualification stage
-            return f"""You are {self.agent_name} from {self.company_name}. Keep responses short and conversational.
+        self._response_cache[cache_key] = ai_response
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
+    
+    def _build_prompt_templates(self):
+        """Pre-substitute agent constants into the per-stage prompt templates"""
+        # Opening line spoken verbatim on the first turn
+        self._greeting_body = (
+            f"this is {self.agent_name} calling on behalf of {self.contact_person} from {self.company_name}. "
+            "Do you have a quick moment to discuss business financing?"
+        )
+        
+        # Qualification stage
+        self._tpl_qual = f"""You are {self.agent_name} from {self.company_name}. Keep responses short and conversational.
             
             Ask ONE question at a time:
             - "What type of financing are you looking for?"
@@ -114,9 +307,8 @@ class AILogic:
             Be conversational, not scripted. Speak quickly and efficiently.
             Respond immediately without delays."""
         
-        else:
-            # Scheduling stage
-            return f"""You are {self.agent_name} from {self.company_name}. {lead_name} is interested.
+        # Scheduling stage
+        self._tpl_sched = f"""You are {self.agent_name} from {self.company_name}. {{lead_name}} is interested.
             
             Move to scheduling naturally:
             - "When would be a good time for {self.contact_person} to call you?"
@@ -128,12 +320,29 @@ class AILogic:
             Speak quickly and efficiently.
             Respond immediately without delays."""
     
+    def _greeting(self, lead_name):
+        """Build the deterministic opening greeting"""
+        salutation = f"Hi {lead_name}," if lead_name else "Hi,"
+        return f"{salutation} {self._greeting_body}"
+    
+    def _build_system_prompt(self, lead_name, conversation_length):
+        """Build system prompt based on conversation stage (the first turn is the fixed greeting)"""
+        if conversation_length <= 2:
+            return self._tpl_qual
+        else:
+            return self._render_prompt(lead_name)
+    
+    def _render_prompt_uncached(self, lead_name):
+        """Render the lead-specific scheduling prompt"""
+        return self._tpl_sched.format(lead_name=lead_name)
+    
     def _build_messages(self, system_prompt, context, conversation_history):
         """Build messages for OpenAI API"""
         messages = [{"role": "system", "content": system_prompt}]
         
-        # Add conversation history (last few exchanges)
-        for msg in conversation_history[-self.conversation_memory_turns * 2:]:
+        # Add conversation history, windowed to the last few exchanges
+        start = max(0, len(conversation_history) - self._maxmsgs)
+        for msg in islice(conversation_history, start, None):
             role = "assistant" if msg['speaker'] == self.agent_name else "user"
             messages.append({"role": role, "content": msg['content']})
         
@@ -145,124 +354,171 @@ class AILogic:
     
     def store_user_response(self, call_id, user_response):
         """Store user response in conversation memory"""
-        if call_id:
-            if call_id not in self.conversation_memory:
-                self.conversation_memory[call_id] = []
-            
-            self.conversation_memory[call_id].append({
-                'speaker': 'Caller',
-                'content': user_response,
-                'timestamp': datetime.now().isoformat()
+        self._append_message(call_id, 'Caller', user_response)
+    
+    def _append_message(self, call_id, speaker, content):
+        """Append a message to a call's conversation memory"""
+        if not call_id:
+            return
+        
+        with self._lock_for(call_id):
+            with self._mem_lock:
+                history = self.conversation_memory.get(call_id)
+                if history is None:
+                    history = []
+                # Re-set on every update so the entry's TTL restarts
+                self.conversation_memory[call_id] = history
+            history.append({
+                'speaker': speaker,
+                'content': content,
+                'ts': time.time_ns()
             })
     
-    def analyze_conversation_outcome(self, call_id):
-        """Analyze conversation for positive/negative outcomes"""
+    def _get_history(self, call_id):
+        """Get a snapshot of a call's conversation memory (empty if unknown or expired)"""
+        if not call_id:
+            return ()
+        
+        # Copy under the call's lock so readers never iterate a list mid-append
+        with self._lock_for(call_id):
+            with self._mem_lock:
+                return tuple(self.conversation_memory.get(call_id, ()))
+    
+    def _lock_for(self, call_id):
+        """Get the lock guarding a call's conversation memory"""
+        with self._mem_lock:
+            lock = self._locks.get(call_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[call_id] = lock
+            return lock
+    
+    def _turn_lock_for(self, call_id):
+        """Get the asyncio lock serializing AI turns for a call"""
+        lock = self._turn_locks.get(call_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._turn_locks[call_id] = lock
+        return lock
+    
+    def summarize_call(self, call_id):
+        """Analyze outcome and extract meeting details in a single pass over the conversation"""
         try:
-            conversation = self.conversation_memory.get(call_id, [])
-            
-            # Keywords for analysis
-            positive_keywords = [
-                'interested', 'yes', 'sure', 'okay', 'good', 'great', 'perfect',
-                'meeting', 'schedule', 'tomorrow', 'call back', 'definitely',
-                'absolutely', 'of course', 'sounds good', 'that works'
-            ]
+            conversation = self._get_history(call_id)
             
-            negative_keywords = [
-                'not interested', 'no thanks', 'busy', 'not now', 'later',
-                'not available', 'don\'t call', 'stop calling', 'not interested',
-                'no time', 'too busy', 'maybe later'
-            ]
+            positive_response = False
+            negative_response = False
+            meeting_scheduled = False
+            caller_time = None
+            agent_time = None
+            agent_confirmed = False
             
-            meeting_keywords = [
-                'meeting', 'schedule', 'tomorrow', '3 p.m.', '3 pm', 'appointment',
-                'call back', 'follow up', 'set up', 'book'
-            ]
-            
-            # Analyze user responses
-            user_responses = [msg['content'].lower() for msg in conversation if msg['speaker'] == 'Caller']
-            
-            positive_response = any(
-                any(keyword in response for keyword in positive_keywords)
-                for response in user_responses
-            )
-            
-            negative_response = any(
-                any(keyword in response for keyword in negative_keywords)
-                for response in user_responses
-            )
-            
-            meeting_scheduled = any(
-                any(keyword in msg['content'].lower() for keyword in meeting_keywords)
-                for msg in conversation if msg['speaker'] == self.agent_name
-            )
-            
-            # Determine outcome
-            if positive_response and meeting_scheduled:
-                outcome = 'positive_meeting'
-            elif positive_response:
-                outcome = 'positive'
-            elif negative_response:
-                outcome = 'negative'
-            else:
-                outcome = 'neutral'
+            for msg in conversation:
+                content_lc = msg['content'].lower()
+                
+                if msg['speaker'] == 'Caller':
+                    if not positive_response:
+                        positive_response = _POSITIVE_RE.search(content_lc) is not None
+                    if not negative_response:
+                        negative_response = _NEGATIVE_RE.search(content_lc) is not None
+                    
+                    # Look for time mentions in caller responses
+                    if caller_time is None and _TIME_RE.search(content_lc):
+                        caller_time = msg['content']
+                
+                elif msg['speaker'] == self.agent_name:
+                    if not meeting_scheduled:
+                        meeting_scheduled = _MEETING_RE.search(content_lc) is not None
+                    
+                    # Also check agent's messages for meeting confirmations
+                    if not agent_confirmed and _CONFIRMATION_RE.search(content_lc):
+                        agent_confirmed = True
+                        spans = {_normalize_time_span(span) for span in _TIME_RE.findall(content_lc)}
+                        for span, canonical in _CANONICAL_TIMES:
+                            if span in spans:
+                                agent_time = canonical
+                                break
             
             return {
-                'outcome': outcome,
+                'outcome': _classify_outcome(positive_response, negative_response, meeting_scheduled),
                 'positive_response': positive_response,
                 'negative_response': negative_response,
                 'meeting_scheduled': meeting_scheduled,
-                'conversation_length': len(conversation)
+                'conversation_length': len(conversation),
+                'meeting_time': agent_time or caller_time
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing conversation outcome: {str(e)}")
+            logger.error(f"Error summarizing call: {str(e)}")
             return {
                 'outcome': 'unknown',
                 'positive_response': False,
                 'negative_response': False,
                 'meeting_scheduled': False,
-                'conversation_length': 0
+                'conversation_length': 0,
+                'meeting_time': None
             }
     
-    def extract_meeting_details(self, call_id):
-        """Extract meeting details from conversation"""
+    def analyze_conversation_outcome(self, call_id):
+        """Analyze conversation for positive/negative outcomes"""
+        summary = self.summarize_call(call_id)
+        summary.pop('meeting_time')
+        return summary
+    
+    def analyze_many(self, call_ids):
+        """Analyze outcomes for many calls with one regex sweep per keyword set"""
         try:
-            conversation = self.conversation_memory.get(call_id, [])
-            meeting_time = None
+            conversations = [self._get_history(call_id) for call_id in call_ids]
             
-            # Look for time mentions in conversation
-            for msg in conversation:
-                if msg['speaker'] == 'Caller':
-                    content = msg['content'].lower()
-                    if any(time_word in content for time_word in ['pm', 'am', 'o\'clock', 'hour', 'tomorrow', 'today', 'week', '3 p.m.', '3 pm', '3:00']):
-                        meeting_time = msg['content']
-                        break
+            # Flatten each speaker's messages for every call into one buffer
+            caller_blob, caller_ends = _join_segments(
+                '\n'.join(msg['content'].lower() for msg in conv if msg['speaker'] == 'Caller')
+                for conv in conversations
+            )
+            agent_blob, agent_ends = _join_segments(
+                '\n'.join(msg['content'].lower() for msg in conv if msg['speaker'] == self.agent_name)
+                for conv in conversations
+            )
             
-            # Also check agent's messages for meeting confirmations
-            for msg in conversation:
-                if msg['speaker'] == self.agent_name:
-                    content = msg['content'].lower()
-                    if any(keyword in content for keyword in ['tomorrow', '3 p.m.', '3 pm', 'schedule', 'meeting']):
-                        if '3 p.m.' in content or '3 pm' in content:
-                            meeting_time = '3:00 PM MST'
-                        elif 'tomorrow' in content:
-                            meeting_time = 'Tomorrow (Time TBD)'
-                        break
+            positive = _segments_with_match(_POSITIVE_RE, caller_blob, caller_ends)
+            negative = _segments_with_match(_NEGATIVE_RE, caller_blob, caller_ends)
+            meeting = _segments_with_match(_MEETING_RE, agent_blob, agent_ends)
             
-            return meeting_time
+            return [
+                {
+                    'outcome': _classify_outcome(i in positive, i in negative, i in meeting),
+                    'positive_response': i in positive,
+                    'negative_response': i in negative,
+                    'meeting_scheduled': i in meeting,
+                    'conversation_length': len(conv)
+                }
+                for i, conv in enumerate(conversations)
+            ]
             
         except Exception as e:
-            logger.error(f"Error extracting meeting details: {str(e)}")
-            return None
+            logger.error(f"Error analyzing conversation outcomes: {str(e)}")
+            return [self.analyze_conversation_outcome(call_id) for call_id in call_ids]
+    
+    def extract_meeting_details(self, call_id):
+        """Extract meeting details from conversation"""
+        return self.summarize_call(call_id)['meeting_time']
     
     def get_conversation_history(self, call_id):
         """Get conversation history for a call"""
-        return self.conversation_memory.get(call_id, [])
+        return [
+            {'speaker': msg['speaker'], 'content': msg['content'], 'timestamp': _iso(msg['ts'])}
+            for msg in self._get_history(call_id)
+        ]
     
     def clear_conversation(self, call_id):
         """Clear conversation memory for a call"""
-        if call_id in self.conversation_memory:
-            del self.conversation_memory[call_id]
+        with self._mem_lock:
+            self.conversation_memory.pop(call_id, None)
+    
+    async def close(self):
+        """Close the OpenAI client and its pooled connections"""
+        if self.client:
+            await self.client.close()
     
     def is_configured(self):
         """Check if AI is properly configured"""
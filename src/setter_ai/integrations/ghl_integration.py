@@ -4,16 +4,24 @@ GHL (GoHighLevel) Integration Module
 Handles all GHL API interactions for lead management
 """
 
-import json
-import requests
+import ciso8601
+import httpx
+import orjson
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from ..utils.async_loop import run_async
+from ..utils.phone import normalize_phone
 
 logger = logging.getLogger(__name__)
 
 class GHLIntegration:
     """GoHighLevel API integration class"""
     
+    # Contacts paging: page size and safety cap on pages per poll
+    LEADS_PAGE_SIZE = 100
+    MAX_LEAD_PAGES = 10
+    
     def __init__(self, config):
         """Initialize GHL integration with config"""
         self.config = config
@@ -25,111 +33,133 @@ class GHLIntegration:
         
         if not self.api_key or not self.location_id:
             logger.warning("GHL credentials not configured")
+        
+        # Shared async client; the sync methods run on it via the background loop
+        self._aclient = httpx.AsyncClient(
+            base_url='https://rest.gohighlevel.com/v1/',
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
     
     def get_leads(self):
         """Fetch leads from GHL API"""
+        return run_async(self.aget_leads())
+    
+    async def aget_leads(self):
+        """Fetch leads from GHL API using the shared async client"""
         try:
             if not self.api_key or not self.location_id:
                 logger.warning("GHL credentials not configured, using dummy leads")
                 return self.get_dummy_leads()
             
-            # GHL API endpoint for contacts - using the correct endpoint
-            url = f"https://rest.gohighlevel.com/v1/contacts/"
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
+            # Get hours limit from config (convert check interval to hours)
+            check_interval_hours = self.check_interval / 60.0  # Convert minutes to hours
+            cutoff_ts = (datetime.now(timezone.utc) - timedelta(hours=check_interval_hours)).timestamp()
             
-            # Add query parameters for location and limit
-            params = {
-                'locationId': self.location_id,
-                'limit': 100,  # Get up to 100 contacts
-                'skip': 0
-            }
-            
-            logger.info(f"Fetching leads from GHL API: {url}")
-            response = requests.get(url, headers=headers, params=params)
+            logger.info(f"Filtering leads from last {check_interval_hours:.1f} hours (check interval: {self.check_interval} minutes)")
             
-            if response.status_code == 200:
-                data = response.json()
-                leads = []
+            leads = []
+            for page in range(self.MAX_LEAD_PAGES):
+                logger.info(f"Fetching leads from GHL API (page {page + 1})")
+                response = await self._aclient.get("contacts/", params=self._contacts_params(page))
                 
-                # Get hours limit from config (convert check interval to hours)
-                check_interval_hours = self.check_interval / 60.0  # Convert minutes to hours
-                cutoff_time = datetime.now() - timedelta(hours=check_interval_hours)
+                if response.status_code != 200:
+                    logger.error(f"GHL API error: {response.status_code} - {response.text}")
+                    if page == 0:
+                        return self.get_dummy_leads()
+                    break
                 
-                logger.info(f"Filtering leads from last {check_interval_hours:.1f} hours (check interval: {self.check_interval} minutes)")
+                contacts = orjson.loads(response.content).get('contacts', [])
+                page_leads, reached_cutoff = self._filter_new_contacts(contacts, cutoff_ts)
+                leads.extend(page_leads)
                 
-                for contact in data.get('contacts', []):
-                    # Check if lead was created within the time limit
-                    created_at = contact.get('createdAt')
-                    if created_at:
-                        try:
-                            lead_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                            if lead_time < cutoff_time:
-                                continue  # Skip leads older than the check interval
-                        except:
-                            # If date parsing fails, include the lead
-                            pass
-                    
-                    # Only get leads that haven't been called yet
-                    lead = {
-                        'id': contact.get('id'),
-                        'firstName': contact.get('firstName', ''),
-                        'lastName': contact.get('lastName', ''),
-                        'email': contact.get('email', ''),
-                        'phone': contact.get('phone', ''),
-                        'companyName': contact.get('companyName', ''),
-                        'customField': contact.get('customField', {}),
-                        'source': 'ghl',
-                        'created_at': contact.get('createdAt'),
-                        'updated_at': contact.get('updatedAt')
-                    }
-                    leads.append(lead)
-                
-                logger.info(f"Retrieved {len(leads)} leads from GHL (last {check_interval_hours:.1f} hours)")
-                return leads
-            else:
-                logger.error(f"GHL API error: {response.status_code} - {response.text}")
-                return self.get_dummy_leads()
+                if reached_cutoff or len(contacts) < self.LEADS_PAGE_SIZE:
+                    break
+            
+            logger.info(f"Retrieved {len(leads)} leads from GHL (last {check_interval_hours:.1f} hours)")
+            return leads
                 
         except Exception as e:
             logger.error(f"Error getting leads from GHL: {str(e)}")
             return self.get_dummy_leads()
     
+    def _contacts_params(self, page):
+        """Query parameters for one page of contacts"""
+        # Newest contacts first so paging can stop at the cutoff
+        return {
+            'locationId': self.location_id,
+            'limit': self.LEADS_PAGE_SIZE,
+            'skip': page * self.LEADS_PAGE_SIZE,
+            'sortBy': 'createdAt',
+            'sort': 'desc'
+        }
+    
+    def _filter_new_contacts(self, contacts, cutoff_ts):
+        """Convert contacts created after the cutoff to leads, noting whether the page ended past the cutoff"""
+        leads = []
+        lead_ts = 0.0
+        
+        for contact in contacts:
+            # Check if lead was created within the time limit (0.0 = unknown date)
+            created_at = contact.get('createdAt')
+            lead_ts = 0.0
+            if created_at:
+                try:
+                    lead_ts = ciso8601.parse_datetime(created_at).timestamp()
+                except (ValueError, TypeError):
+                    # If date parsing fails (or createdAt is not a string), include the lead
+                    pass
+            
+            if lead_ts and lead_ts < cutoff_ts:
+                continue  # Skip leads older than the check interval
+            
+            # Only get leads that haven't been called yet
+            lead = {
+                'id': contact.get('id'),
+                'firstName': contact.get('firstName', ''),
+                'lastName': contact.get('lastName', ''),
+                'email': contact.get('email', ''),
+                'phone': normalize_phone(contact.get('phone') or ''),
+                'companyName': contact.get('companyName', ''),
+                'customField': contact.get('customField', {}),
+                'source': 'ghl',
+                'created_at': contact.get('createdAt'),
+                'updated_at': contact.get('updatedAt')
+            }
+            leads.append(lead)
+        
+        reached_cutoff = bool(lead_ts) and lead_ts < cutoff_ts
+        return leads, reached_cutoff
+    
     def get_dummy_leads(self):
         """Get dummy leads for testing"""
         return self.config.get('dummy_leads', [])
     
     def filter_available_leads(self, leads, called_lead_ids):
-        """Filter out leads that have already been called"""
+        """Filter out leads that have already been called (pass a set for O(1) lookups)"""
         available_leads = [lead for lead in leads if lead.get('id') not in called_lead_ids]
         logger.info(f"Found {len(available_leads)} available leads out of {len(leads)} total")
         return available_leads
     
     def update_lead_status(self, lead_id, status, outcome=None):
         """Update lead status in GHL (if needed)"""
+        return run_async(self.aupdate_lead_status(lead_id, status, outcome))
+    
+    def get_lead_by_id(self, lead_id):
+        """Get specific lead by ID"""
+        return run_async(self.aget_lead_by_id(lead_id))
+    
+    async def aupdate_lead_status(self, lead_id, status, outcome=None):
+        """Update lead status in GHL using the shared async client"""
         try:
             if not self.api_key or not self.location_id:
                 return False
             
-            # GHL API endpoint for updating contact
-            url = f"https://rest.gohighlevel.com/v1/contacts/{lead_id}"
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Update custom fields to track call status
-            data = {
-                'customField': {
-                    'c_call_status': status,
-                    'c_call_outcome': outcome or 'unknown',
-                    'c_last_called': datetime.now().isoformat()
-                }
-            }
-            
-            response = requests.put(url, headers=headers, json=data)
+            response = await self._aclient.put(f"contacts/{lead_id}", content=orjson.dumps(self._status_payload(status, outcome)))
             
             if response.status_code == 200:
                 logger.info(f"Updated lead {lead_id} status to {status}")
@@ -142,32 +172,16 @@ class GHLIntegration:
             logger.error(f"Error updating lead status: {str(e)}")
             return False
     
-    def get_lead_by_id(self, lead_id):
-        """Get specific lead by ID"""
+    async def aget_lead_by_id(self, lead_id):
+        """Get specific lead by ID using the shared async client"""
         try:
             if not self.api_key or not self.location_id:
                 return None
             
-            url = f"https://rest.gohighlevel.com/v1/contacts/{lead_id}"
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(url, headers=headers)
+            response = await self._aclient.get(f"contacts/{lead_id}")
             
             if response.status_code == 200:
-                contact = response.json()
-                return {
-                    'id': contact.get('id'),
-                    'firstName': contact.get('firstName', ''),
-                    'lastName': contact.get('lastName', ''),
-                    'email': contact.get('email', ''),
-                    'phone': contact.get('phone', ''),
-                    'companyName': contact.get('companyName', ''),
-                    'customField': contact.get('customField', {}),
-                    'source': 'ghl'
-                }
+                return self._contact_to_lead(orjson.loads(response.content))
             else:
                 logger.error(f"Failed to get lead {lead_id}: {response.status_code}")
                 return None
@@ -176,6 +190,33 @@ class GHLIntegration:
             logger.error(f"Error getting lead {lead_id}: {str(e)}")
             return None
     
+    async def aclose(self):
+        """Close the async client and its pooled connections"""
+        await self._aclient.aclose()
+    
+    def _status_payload(self, status, outcome=None):
+        """Build the custom field payload used to track call status"""
+        return {
+            'customField': {
+                'c_call_status': status,
+                'c_call_outcome': outcome or 'unknown',
+                'c_last_called': datetime.now().isoformat()
+            }
+        }
+    
+    def _contact_to_lead(self, contact):
+        """Convert a GHL contact payload to a lead dict"""
+        return {
+            'id': contact.get('id'),
+            'firstName': contact.get('firstName', ''),
+            'lastName': contact.get('lastName', ''),
+            'email': contact.get('email', ''),
+            'phone': normalize_phone(contact.get('phone') or ''),
+            'companyName': contact.get('companyName', ''),
+            'customField': contact.get('customField', {}),
+            'source': 'ghl'
+        }
+    
     def is_configured(self):
         """Check if GHL is properly configured"""
         return bool(self.api_key and self.location_id)
@@ -0,0 +1,34 @@
+"""
+Background event loop for Setter.AI
+===================================
+
+Runs a single asyncio event loop in a daemon thread so synchronous Flask
+handlers can drive async clients (OpenAI, GHL) without blocking on each other.
+"""
+
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def get_loop():
+    """Get the shared background event loop, starting it on first use"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='setter-ai-loop', daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+def run_async(coro, timeout=None):
+    """Run a coroutine on the background loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    return future.result(timeout)
+
+def submit_async(coro):
+    """Schedule a coroutine on the background loop without waiting for it"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
@@ -8,13 +8,33 @@ and config.json file. Environment variables take priority over config.json.
 
 import os
 import json
+import functools
+import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
 
+# Load environment variables from .env file once; child processes inherit
+# the populated environment and the flag, so they skip the re-read
+if not os.environ.get("_SETTER_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_SETTER_DOTENV_LOADED"] = "1"
+
+# Dotted-path lookup table built from the cached config by get_config_value
+_flat_config_cache = {}
+
+@functools.lru_cache(maxsize=1)
 def load_config():
+    """Load configuration once per process (cached; see invalidate_config)"""
+    return _load_config_uncached()
+
+def invalidate_config():
+    """Clear the cached configuration so the next load_config() re-reads it"""
+    load_config.cache_clear()
+    _flat_config_cache.clear()
+
+def _load_config_uncached():
     """Load configuration from environment variables first, then config.json as fallback"""
     try:
         # Start with empty config - environment variables take absolute priority
@@ -27,9 +47,9 @@ def load_config():
             try:
                 with open(config_path, 'r') as f:
                     config = json.load(f)
-                print("📁 Loaded fallback configuration from config.json")
+                logger.debug("Loaded fallback configuration from config.json")
             except Exception as e:
-                print(f"⚠️  Warning: Could not load config.json: {e}")
+                logger.warning("Could not load config.json: %s", e)
                 config = {}
         
         # Override with environment variables (environment takes absolute priority)
@@ -43,98 +63,84 @@ def load_config():
     except Exception as e:
         raise RuntimeError(f"Failed to load configuration: {str(e)}")
 
-def _merge_with_env_vars(config):
-    """Merge config.json with environment variables (env vars take priority)"""
-    
+def _to_bool(value):
+    """Convert a config/env value to bool ("true" in any case is True)"""
+    return str(value).lower() == "true"
+
+# (dotted config path, environment variable, converter, default);
+# a converter of None keeps the value as-is
+_ENV_MAP = [
     # GHL Configuration
-    if "ghl" not in config:
-        config["ghl"] = {}
-    
-    config["ghl"]["api_key"] = os.getenv("GHL_API_KEY", config.get("ghl", {}).get("api_key", ""))
-    config["ghl"]["location_id"] = os.getenv("GHL_LOCATION_ID", config.get("ghl", {}).get("location_id", ""))
-    config["ghl"]["check_interval_minutes"] = int(os.getenv("LEAD_CHECK_INTERVAL_MINUTES", 
-                                                           str(config.get("ghl", {}).get("check_interval_minutes", 10))))
-    config["ghl"]["auto_call_enabled"] = os.getenv("AUTO_CALL_ENABLED", 
-                                                   str(config.get("ghl", {}).get("auto_call_enabled", True))).lower() == "true"
-    config["ghl"]["leads_hours_limit"] = int(os.getenv("LEADS_HOURS_LIMIT", 
-                                                       str(config.get("ghl", {}).get("leads_hours_limit", 24))))
+    ("ghl.api_key", "GHL_API_KEY", None, ""),
+    ("ghl.location_id", "GHL_LOCATION_ID", None, ""),
+    ("ghl.check_interval_minutes", "LEAD_CHECK_INTERVAL_MINUTES", int, 10),
+    ("ghl.auto_call_enabled", "AUTO_CALL_ENABLED", _to_bool, True),
+    ("ghl.leads_hours_limit", "LEADS_HOURS_LIMIT", int, 24),
     
     # OpenAI Configuration
-    if "openai" not in config:
-        config["openai"] = {}
-    config["openai"]["api_key"] = os.getenv("OPENAI_API_KEY", config.get("openai", {}).get("api_key", ""))
+    ("openai.api_key", "OPENAI_API_KEY", None, ""),
     
     # Twilio Configuration
-    if "twilio" not in config:
-        config["twilio"] = {}
-    config["twilio"]["account_sid"] = os.getenv("TWILIO_ACCOUNT_SID", config.get("twilio", {}).get("account_sid", ""))
-    config["twilio"]["auth_token"] = os.getenv("TWILIO_AUTH_TOKEN", config.get("twilio", {}).get("auth_token", ""))
-    config["twilio"]["phone_number"] = os.getenv("TWILIO_PHONE_NUMBER", config.get("twilio", {}).get("phone_number", ""))
+    ("twilio.account_sid", "TWILIO_ACCOUNT_SID", None, ""),
+    ("twilio.auth_token", "TWILIO_AUTH_TOKEN", None, ""),
+    ("twilio.phone_number", "TWILIO_PHONE_NUMBER", None, ""),
     
     # Webhook Configuration
-    config["webhook_base_url"] = os.getenv("WEBHOOK_BASE_URL", config.get("webhook_base_url", "http://localhost:5000"))
+    ("webhook_base_url", "WEBHOOK_BASE_URL", None, "http://localhost:5000"),
     
     # Call Settings
-    if "call_settings" not in config:
-        config["call_settings"] = {}
-    
-    call_settings = config["call_settings"]
-    call_settings["max_call_duration"] = int(os.getenv("MAX_CALL_DURATION", 
-                                                      str(call_settings.get("max_call_duration", 300))))
-    call_settings["retry_attempts"] = int(os.getenv("RETRY_ATTEMPTS", 
-                                                   str(call_settings.get("retry_attempts", 2))))
-    call_settings["call_delay_minutes"] = int(os.getenv("CALL_DELAY_MINUTES", 
-                                                       str(call_settings.get("call_delay_minutes", 5))))
-    call_settings["lead_check_interval_minutes"] = int(os.getenv("LEAD_CHECK_INTERVAL_MINUTES", 
-                                                                str(call_settings.get("lead_check_interval_minutes", 10))))
+    ("call_settings.max_call_duration", "MAX_CALL_DURATION", int, 300),
+    ("call_settings.retry_attempts", "RETRY_ATTEMPTS", int, 2),
+    ("call_settings.call_delay_minutes", "CALL_DELAY_MINUTES", int, 5),
+    ("call_settings.lead_check_interval_minutes", "LEAD_CHECK_INTERVAL_MINUTES", int, 10),
     
     # Business Hours
-    if "business_hours" not in call_settings:
-        call_settings["business_hours"] = {}
-    call_settings["business_hours"]["start"] = os.getenv("BUSINESS_HOURS_START", 
-                                                        call_settings.get("business_hours", {}).get("start", "00:00"))
-    call_settings["business_hours"]["end"] = os.getenv("BUSINESS_HOURS_END", 
-                                                      call_settings.get("business_hours", {}).get("end", "23:59"))
-    call_settings["business_hours"]["timezone"] = os.getenv("BUSINESS_HOURS_TIMEZONE", 
-                                                           call_settings.get("business_hours", {}).get("timezone", "America/New_York"))
+    ("call_settings.business_hours.start", "BUSINESS_HOURS_START", None, "00:00"),
+    ("call_settings.business_hours.end", "BUSINESS_HOURS_END", None, "23:59"),
+    ("call_settings.business_hours.timezone", "BUSINESS_HOURS_TIMEZONE", None, "America/New_York"),
     
     # Voice Settings
-    if "voice_settings" not in call_settings:
-        call_settings["voice_settings"] = {}
-    voice_settings = call_settings["voice_settings"]
-    voice_settings["voice"] = os.getenv("VOICE_TYPE", voice_settings.get("voice", "en-US-Neural2-F"))
-    voice_settings["speech_rate"] = os.getenv("SPEECH_RATE", voice_settings.get("speech_rate", "1.0"))
-    voice_settings["pitch"] = os.getenv("VOICE_PITCH", voice_settings.get("pitch", "1.0"))
-    voice_settings["volume"] = os.getenv("VOICE_VOLUME", voice_settings.get("volume", "1.0"))
-    voice_settings["gender"] = os.getenv("VOICE_GENDER", voice_settings.get("gender", "female"))
+    ("call_settings.voice_settings.voice", "VOICE_TYPE", None, "en-US-Neural2-F"),
+    ("call_settings.voice_settings.speech_rate", "SPEECH_RATE", None, "1.0"),
+    ("call_settings.voice_settings.pitch", "VOICE_PITCH", None, "1.0"),
+    ("call_settings.voice_settings.volume", "VOICE_VOLUME", None, "1.0"),
+    ("call_settings.voice_settings.gender", "VOICE_GENDER", None, "female"),
     
     # Conversation Settings
-    if "conversation_settings" not in call_settings:
-        call_settings["conversation_settings"] = {}
-    conv_settings = call_settings["conversation_settings"]
-    conv_settings["speech_timeout"] = os.getenv("SPEECH_TIMEOUT", conv_settings.get("speech_timeout", "auto"))
-    conv_settings["gather_timeout"] = int(os.getenv("GATHER_TIMEOUT", str(conv_settings.get("gather_timeout", 5))))
-    conv_settings["language"] = os.getenv("CONVERSATION_LANGUAGE", conv_settings.get("language", "en-US"))
-    conv_settings["speech_model"] = os.getenv("SPEECH_MODEL", conv_settings.get("speech_model", "phone_call"))
-    conv_settings["interruption_threshold"] = float(os.getenv("INTERRUPTION_THRESHOLD", 
-                                                             str(conv_settings.get("interruption_threshold", 0.5))))
-    conv_settings["speech_timeout_seconds"] = float(os.getenv("SPEECH_TIMEOUT_SECONDS", 
-                                                             str(conv_settings.get("speech_timeout_seconds", 1.5))))
+    ("call_settings.conversation_settings.speech_timeout", "SPEECH_TIMEOUT", None, "auto"),
+    ("call_settings.conversation_settings.gather_timeout", "GATHER_TIMEOUT", int, 5),
+    ("call_settings.conversation_settings.language", "CONVERSATION_LANGUAGE", None, "en-US"),
+    ("call_settings.conversation_settings.speech_model", "SPEECH_MODEL", None, "phone_call"),
+    ("call_settings.conversation_settings.interruption_threshold", "INTERRUPTION_THRESHOLD", float, 0.5),
+    ("call_settings.conversation_settings.speech_timeout_seconds", "SPEECH_TIMEOUT_SECONDS", float, 1.5),
     
     # AI Settings
-    if "ai_settings" not in config:
-        config["ai_settings"] = {}
-    ai_settings = config["ai_settings"]
-    ai_settings["model"] = os.getenv("AI_MODEL", ai_settings.get("model", "gpt-4"))
-    ai_settings["max_tokens"] = int(os.getenv("AI_MAX_TOKENS", str(ai_settings.get("max_tokens", 150))))
-    ai_settings["temperature"] = float(os.getenv("AI_TEMPERATURE", str(ai_settings.get("temperature", 0.7))))
-    ai_settings["conversation_memory_turns"] = int(os.getenv("AI_CONVERSATION_MEMORY_TURNS", 
-                                                            str(ai_settings.get("conversation_memory_turns", 5))))
-    ai_settings["personality"] = os.getenv("AI_PERSONALITY", ai_settings.get("personality", "professional_friendly"))
-    ai_settings["agent_name"] = os.getenv("AI_AGENT_NAME", ai_settings.get("agent_name", "Maayaa"))
-    ai_settings["company_name"] = os.getenv("AI_COMPANY_NAME", ai_settings.get("company_name", "LoanCater"))
-    ai_settings["contact_person"] = os.getenv("AI_CONTACT_PERSON", ai_settings.get("contact_person", "Ryan"))
-    ai_settings["contact_email"] = os.getenv("AI_CONTACT_EMAIL", ai_settings.get("contact_email", "ryan@loancater.com"))
+    ("ai_settings.model", "AI_MODEL", None, "gpt-4"),
+    ("ai_settings.max_tokens", "AI_MAX_TOKENS", int, 150),
+    ("ai_settings.temperature", "AI_TEMPERATURE", float, 0.7),
+    ("ai_settings.conversation_memory_turns", "AI_CONVERSATION_MEMORY_TURNS", int, 5),
+    ("ai_settings.response_cache_size", "AI_RESPONSE_CACHE_SIZE", int, 1024),
+    ("ai_settings.personality", "AI_PERSONALITY", None, "professional_friendly"),
+    ("ai_settings.agent_name", "AI_AGENT_NAME", None, "Maayaa"),
+    ("ai_settings.company_name", "AI_COMPANY_NAME", None, "LoanCater"),
+    ("ai_settings.contact_person", "AI_CONTACT_PERSON", None, "Ryan"),
+    ("ai_settings.contact_email", "AI_CONTACT_EMAIL", None, "ryan@loancater.com"),
+]
+
+def _merge_with_env_vars(config):
+    """Merge config.json with environment variables (env vars take priority)"""
+    for path, env_var, converter, default in _ENV_MAP:
+        *parents, leaf = path.split('.')
+        
+        # Walk (creating as needed) to the parent dict once per key
+        section = config
+        for key in parents:
+            section = section.setdefault(key, {})
+        
+        value = os.environ.get(env_var)
+        if value is None:
+            value = section.get(leaf, default)
+        section[leaf] = converter(value) if converter else value
     
     return config
 
@@ -154,23 +160,26 @@ def get_webhook_url(endpoint=""):
         return f"http://localhost:5000/{endpoint}".rstrip('/')
 
 def get_config_value(key, default=None):
-    """Get a specific configuration value"""
+    """Get a specific configuration value by dotted path (e.g. "ghl.api_key")"""
     try:
-        config = load_config()
-        keys = key.split('.')
-        value = config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        if not _flat_config_cache:
+            _flat_config_cache.update(_flatten_config(load_config()))
         
-        return value
+        return _flat_config_cache.get(key, default)
         
     except Exception:
         return default
 
+def _flatten_config(config, prefix=""):
+    """Map every dotted path in the config (sections included) to its value"""
+    flat = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten_config(value, f"{path}."))
+    return flat
+
 def _validate_required_keys(config):
     """Validate that required API keys and configuration are present"""
     required_keys = [
@@ -198,13 +207,16 @@ def _validate_required_keys(config):
             missing_keys.append(f"{env_var} (config path: {config_path})")
     
     if missing_keys:
+        logger.error("Missing required API keys: %s", ", ".join(missing_keys))
+        
+        # main.py reports str(e), so the exception carries the full key list too
         error_msg = "❌ Missing required API keys:\n"
         error_msg += "\n".join(f"  - {key}" for key in missing_keys)
         error_msg += "\n\nPlease set these environment variables or add them to your .env file."
         error_msg += "\nSee .env.example for reference."
         raise RuntimeError(error_msg)
     
-    print("✅ All required API keys are configured")
+    logger.info("All required API keys are configured")
 
 def get_environment_help():
     """Get help text for environment variable configuration"""
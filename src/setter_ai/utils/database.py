@@ -5,10 +5,43 @@ Database utilities for Setter.AI
 Handles database initialization and common operations.
 """
 
+import atexit
+import logging
 import os
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Idle connections kept per database path for reuse by the next thread
+POOL_SIZE = 8
+
+# Per-thread checked-out connections, keyed by database path
+_local = threading.local()
+_holders = weakref.WeakSet()
+_pools = {}
+_pool_lock = threading.Lock()
+
+def _close_connections(conns):
+    """Close and forget every connection in conns"""
+    for conn in list(conns.values()):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    conns.clear()
+
+class _ThreadConnections:
+    """One thread's connections; closed when the thread exits and this is collected"""
+    __slots__ = ('conns', '__weakref__')
+    
+    def __init__(self):
+        self.conns = {}
+        weakref.finalize(self, _close_connections, self.conns)
+
 def get_db_path():
     """Get the database file path"""
     db_dir = Path(__file__).parent.parent.parent.parent
@@ -17,7 +50,7 @@ def get_db_path():
 def init_database(db_path):
     """Initialize the database with required tables"""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_connection(db_path)
         cursor = conn.cursor()
         
         # Create call_records table
@@ -59,21 +92,115 @@ def init_database(db_path):
             )
         ''')
         
+        # A missing meeting email is stored as NULL; convert legacy empty strings
+        cursor.execute("UPDATE call_records SET meeting_email = NULL WHERE meeting_email = ''")
+        
+        # Indexes on lookup and filter columns. call_sid serves the status
+        # webhook lookup; (call_start_time, status) is scanned in reverse for
+        # the dashboard's ORDER BY call_start_time DESC LIMIT 10, so no
+        # separate DESC index on call_start_time is needed
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_call_records_lead_id ON call_records(lead_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_call_records_call_sid ON call_records(call_sid)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_call_records_status ON call_records(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_call_records_start_time_status ON call_records(call_start_time, status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_call_records_meeting ON call_records(meeting_email) WHERE meeting_email IS NOT NULL')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_called_leads_call_id ON called_leads(call_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_called_leads_call_date ON called_leads(call_date)')
+        
         conn.commit()
-        conn.close()
         
-        print("Database initialized successfully")
+        logger.debug("Database initialized successfully")
         
     except Exception as e:
-        print(f"Error initializing database: {str(e)}")
+        logger.error("Error initializing database: %s", e)
         raise
 
+def _open_connection(db_path):
+    """Open a connection with the application's PRAGMAs"""
+    # check_same_thread=False so pooled connections can move between threads
+    # (one at a time). Autocommit mode: transactions are opened explicitly
+    # (see transaction()) and writers wait up to 5 s on a locked database
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA wal_autocheckpoint=1000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-20000')
+    return conn
+
 def get_connection(db_path):
-    """Get a database connection"""
-    return sqlite3.connect(db_path)
+    """Get this thread's database connection, taking one from the pool on first use"""
+    holder = getattr(_local, 'holder', None)
+    if holder is None:
+        holder = _local.holder = _ThreadConnections()
+        _holders.add(holder)
+    
+    key = str(db_path)
+    conn = holder.conns.get(key)
+    if conn is None:
+        with _pool_lock:
+            pool = _pools.get(key)
+            conn = pool.pop() if pool else None
+        if conn is None:
+            conn = _open_connection(db_path)
+        holder.conns[key] = conn
+    return conn
+
+def release_connection(db_path):
+    """Return this thread's connection to the pool (closing it if the pool is full)"""
+    holder = getattr(_local, 'holder', None)
+    key = str(db_path)
+    conn = holder.conns.pop(key, None) if holder is not None else None
+    if conn is None:
+        return
+    
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        with _pool_lock:
+            pool = _pools.setdefault(key, [])
+            if len(pool) < POOL_SIZE:
+                pool.append(conn)
+                return
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+@contextmanager
+def transaction(db_path):
+    """Run several writes in one transaction (one commit/fsync for the batch)
+    
+    Takes the write lock up front with BEGIN IMMEDIATE; commits on success
+    and rolls back if the block raises.
+    """
+    conn = get_connection(db_path)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+@atexit.register
+def close_all_connections():
+    """Close every pooled and checked-out connection"""
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        for conn in pool:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+    for holder in list(_holders):
+        _close_connections(holder.conns)
 
 def execute_query(db_path, query, params=None):
     """Execute a database query"""
+    conn = None
     try:
         conn = get_connection(db_path)
         cursor = conn.cursor()
@@ -84,17 +211,21 @@ def execute_query(db_path, query, params=None):
             cursor.execute(query)
         
         result = cursor.fetchall()
+        cursor.close()
         conn.commit()
-        conn.close()
         
         return result
         
     except Exception as e:
-        print(f"Database query error: {str(e)}")
+        # Don't leave a failed transaction open on the cached connection
+        if conn is not None:
+            conn.rollback()
+        logger.error("Database query error: %s", e)
         raise
 
 def execute_update(db_path, query, params=None):
     """Execute a database update/insert"""
+    conn = None
     try:
         conn = get_connection(db_path)
         cursor = conn.cursor()
@@ -104,11 +235,31 @@ def execute_update(db_path, query, params=None):
         else:
             cursor.execute(query)
         
+        cursor.close()
         conn.commit()
-        conn.close()
         
         return True
         
     except Exception as e:
-        print(f"Database update error: {str(e)}")
+        # Don't leave a failed transaction open on the cached connection
+        if conn is not None:
+            conn.rollback()
+        logger.error("Database update error: %s", e)
+        raise
+
+def execute_many(db_path, query, rows):
+    """Execute a batched insert/update for many rows in a single transaction.
+    
+    rows may be any iterable (it is consumed lazily). Callers writing many
+    records should accumulate them and flush every N rows or T seconds
+    rather than calling execute_update per row.
+    """
+    try:
+        with transaction(db_path) as conn:
+            conn.executemany(query, rows)
+        
+        return True
+        
+    except Exception as e:
+        logger.error("Database batch update error: %s", e)
         raise
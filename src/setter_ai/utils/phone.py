@@ -0,0 +1,32 @@
+"""
+Phone number helpers for Setter.AI
+==================================
+
+Normalizes lead phone numbers to E.164 once at ingestion so the outbound
+call path only needs a cheap format check.
+"""
+
+import re
+from functools import lru_cache
+
+_e164_re = re.compile(r'^\+\d{10,15}$')
+_non_digit_re = re.compile(r'\D')
+
+def is_e164(phone_number):
+    """Check whether a phone number is already in E.164 form"""
+    return bool(phone_number) and _e164_re.match(phone_number) is not None
+
+@lru_cache(maxsize=4096)
+def normalize_phone(phone_number):
+    """Normalize a phone number to E.164, defaulting to +1 for bare US numbers"""
+    if not phone_number:
+        return ''
+    if _e164_re.match(phone_number):
+        return phone_number
+
+    digits = _non_digit_re.sub('', phone_number)
+    if not digits:
+        return ''
+    if len(digits) == 10 and not phone_number.lstrip().startswith('+'):
+        return f"+1{digits}"
+    return f"+{digits}"
@@ -5,10 +5,13 @@ Flask Application Factory for Setter.AI
 Creates and configures the Flask application with all routes and middleware.
 """
 
+import asyncio
+import atexit
 import os
-import sqlite3
+import queue
 import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from flask import Flask, jsonify, request, render_template
 import logging
@@ -17,18 +20,24 @@ from ..core.ai_logic import AILogic
 from ..integrations.ghl_integration import GHLIntegration
 from ..integrations.twilio_integration import TwilioIntegration
 from ..utils.config import load_config, get_webhook_url
-from ..utils.database import init_database, get_db_path
+from ..utils.database import init_database, get_db_path, get_connection, execute_update
+from ..utils.async_loop import run_async, submit_async
+from .calls import CallRec, invalidate_dashboard_cache, track_call
+from .routes import register_routes
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lead IDs per called_leads lookup, kept under SQLite's bound-parameter limit
+LEAD_ID_CHUNK = 500
+
 def create_app(config_overrides=None):
     """Create and configure the Flask application"""
     app = Flask(__name__)
     
     # Load configuration
-    config = load_config()
+    config = dict(load_config())  # copy: load_config() returns a shared cached dict
     if config_overrides:
         config.update(config_overrides)
     
@@ -37,34 +46,53 @@ def create_app(config_overrides=None):
     ghl_integration = GHLIntegration(config['ghl'])
     twilio_integration = TwilioIntegration(config['twilio'])
     
+    # Release pooled OpenAI, GHL and Twilio connections on shutdown
+    atexit.register(lambda: run_async(ai_logic.close()))
+    atexit.register(lambda: run_async(ghl_integration.aclose()))
+    atexit.register(twilio_integration.close)
+    
     # Initialize database
     db_path = get_db_path()
     init_database(db_path)
     
-    # Global variables for call tracking
-    active_calls = {}
-    call_history = {}
+    # Global variables for call tracking; call_history holds a CallRec per call,
+    # active_calls the IDs of calls still in progress, and call_sid_to_id
+    # indexes call_history by Twilio CallSid for the status webhook
+    active_calls = set()
+    call_history = OrderedDict()
+    call_sid_to_id = {}
     
-    # Import routes after app creation to avoid circular imports
-    from .routes import register_routes
+    # Register route handlers
     register_routes(app, ai_logic, ghl_integration, twilio_integration, 
-                   active_calls, call_history, db_path)
+                   active_calls, call_history, call_sid_to_id, db_path)
     
-    # Start background monitoring thread
+    # Poll GHL on the background event loop; new lead batches are queued
+    # for the call dispatcher so polling never runs on a web worker
+    lead_queue = queue.Queue()
+    submit_async(poll_leads(ghl_integration, lead_queue))
+    
+    # Start background dispatch thread
     def start_monitoring_thread():
-        """Background thread for monitoring leads every 10 minutes"""
+        """Background thread calling new leads as GHL polls deliver them"""
         def monitor():
             while True:
                 try:
-                    # Get new leads from GHL
-                    leads = ghl_integration.get_leads()
+                    # Wait for the next batch of leads from the GHL poller
+                    leads = lead_queue.get()
+                    
+                    # Filter out leads that have already been called; only this
+                    # batch's IDs are looked up, not the whole called_leads table
+                    lead_ids = [lead['id'] for lead in leads if lead.get('id')]
+                    called_lead_ids = set()
                     
-                    # Filter out leads that have already been called
-                    conn = sqlite3.connect(db_path)
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT lead_id FROM called_leads')
-                    called_lead_ids = [row[0] for row in cursor.fetchall()]
-                    conn.close()
+                    # This thread's cached connection, also used by make_call's writes
+                    cursor = get_connection(db_path).cursor()
+                    for i in range(0, len(lead_ids), LEAD_ID_CHUNK):
+                        chunk = lead_ids[i:i + LEAD_ID_CHUNK]
+                        placeholders = ','.join('?' * len(chunk))
+                        cursor.execute(f'SELECT lead_id FROM called_leads WHERE lead_id IN ({placeholders})', chunk)
+                        called_lead_ids.update(row[0] for row in cursor.fetchall())
+                    cursor.close()
                     
                     available_leads = ghl_integration.filter_available_leads(leads, called_lead_ids)
                     
@@ -75,7 +103,7 @@ def create_app(config_overrides=None):
                         lead = available_leads[0]
                         success = make_call(lead, ai_logic, ghl_integration, 
                                          twilio_integration, active_calls, 
-                                         call_history, db_path)
+                                         call_history, db_path, call_sid_to_id)
                         
                         if success:
                             logger.info(f"Successfully initiated call to {lead.get('firstName', '')} {lead.get('lastName', '')}")
@@ -84,26 +112,35 @@ def create_app(config_overrides=None):
                     else:
                         logger.info("No new leads to call")
                     
-                    # Wait 10 minutes before next check
-                    time.sleep(600)  # 10 minutes
-                    
                 except Exception as e:
                     logger.error(f"Error in monitoring thread: {str(e)}")
-                    time.sleep(60)  # Wait 1 minute on error
         
         # Start monitoring thread
         thread = threading.Thread(target=monitor, daemon=True)
         thread.start()
-        logger.info("GHL lead monitoring thread started (checking every 10 minutes)")
+        logger.info(f"GHL lead monitoring thread started (checking every {ghl_integration.check_interval} minutes)")
     
-    # Start monitoring thread
-    monitor_thread = threading.Thread(target=start_monitoring_thread, daemon=True)
-    monitor_thread.start()
+    # Start monitoring thread (spawns the daemon and returns immediately)
+    start_monitoring_thread()
     
     return app
 
+async def poll_leads(ghl_integration, lead_queue):
+    """Poll GHL for new leads every check interval and queue each batch"""
+    while True:
+        try:
+            leads = await ghl_integration.aget_leads()
+            lead_queue.put(leads)
+            
+            # Wait for the next check interval
+            await asyncio.sleep(ghl_integration.check_interval * 60)
+            
+        except Exception as e:
+            logger.error(f"Error polling GHL leads: {str(e)}")
+            await asyncio.sleep(60)  # Wait 1 minute on error
+
 def make_call(lead, ai_logic, ghl_integration, twilio_integration, 
-              active_calls, call_history, db_path):
+              active_calls, call_history, db_path, call_sid_to_id=None):
     """Make a call to a lead"""
     try:
         # Generate unique call ID
@@ -114,16 +151,17 @@ def make_call(lead, ai_logic, ghl_integration, twilio_integration,
         
         if success:
             # Store call info in memory
-            call_info = {
-                'call_id': call_id,
-                'call_sid': call_sid,
-                'lead_info': lead,
-                'start_time': datetime.now(),
-                'status': 'initiated'
-            }
+            call_info = CallRec(
+                call_id=call_id,
+                call_sid=call_sid,
+                lead_id=lead.get('id', ''),
+                lead_info=lead,
+                start_time=datetime.now(),
+                status='initiated'
+            )
             
-            call_history[call_id] = call_info
-            active_calls[call_id] = call_info
+            active_calls.add(call_id)
+            track_call(call_history, call_sid_to_id, call_id, call_info, active_calls)
             
             # Save initial call record
             call_result = {
@@ -149,35 +187,37 @@ def make_call(lead, ai_logic, ghl_integration, twilio_integration,
         logger.error(f"Error making call: {str(e)}")
         return False
 
+CALL_RECORD_UPSERT = '''
+    INSERT OR REPLACE INTO call_records 
+    (call_id, lead_id, lead_name, phone_number, call_start_time, 
+     status, conversation_data, recording_url, duration, call_sid, meeting_email)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _call_record_row(call_id, call_info, call_result):
+    """Build the call_records row for CALL_RECORD_UPSERT"""
+    lead_info = call_info.lead_info or {}
+    lead_name = f"{lead_info.get('firstName', '')} {lead_info.get('lastName', '')}".strip()
+    
+    return (
+        call_id,
+        lead_info.get('id', ''),
+        lead_name,
+        lead_info.get('phone', ''),
+        call_info.start_time or datetime.now(),
+        call_result.get('status', ''),
+        call_result.get('conversation_data', ''),
+        call_result.get('recording_url', ''),
+        call_result.get('duration', 0),
+        call_result.get('call_sid', ''),
+        call_result.get('meeting_email') or None  # no meeting is NULL, never ''
+    )
+
 def save_call_record(call_id, call_info, call_result, db_path):
     """Save call record to database"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        lead_info = call_info.get('lead_info', {})
-        lead_name = f"{lead_info.get('firstName', '')} {lead_info.get('lastName', '')}".strip()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO call_records 
-            (call_id, lead_id, lead_name, phone_number, call_start_time, 
-             status, conversation_data, recording_url, duration, call_sid)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            call_id,
-            lead_info.get('id', ''),
-            lead_name,
-            lead_info.get('phone', ''),
-            call_info.get('start_time', datetime.now()),
-            call_result.get('status', ''),
-            call_result.get('conversation_data', ''),
-            call_result.get('recording_url', ''),
-            call_result.get('duration', 0),
-            call_result.get('call_sid', '')
-        ))
-        
-        conn.commit()
-        conn.close()
+        execute_update(db_path, CALL_RECORD_UPSERT, _call_record_row(call_id, call_info, call_result))
+        invalidate_dashboard_cache()
         
         logger.info(f"Call record saved: {call_id}")
         
@@ -0,0 +1,102 @@
+"""
+Call tracking state for Setter.AI
+=================================
+
+In-memory call records shared by the app factory, the lead monitor and the
+route handlers, plus the short-lived /dashboard payload cache.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+# Most recent calls kept in the in-memory call_history (oldest evicted first)
+MAX_CALL_HISTORY = 1000
+
+# Guards call_history and call_sid_to_id, shared by the request threads and the monitor
+_calls_lock = threading.Lock()
+
+# Short-lived /dashboard payload cache so polling browsers share one query
+DASHBOARD_CACHE_TTL = 1.5
+_DASH_CACHE = {'ts': 0.0, 'body': None}
+_dash_lock = threading.Lock()
+
+@dataclass
+class CallRec:
+    """In-memory state for one call"""
+    __slots__ = ('call_id', 'call_sid', 'lead_id', 'lead_info', 'start_time', 'status')
+    
+    call_id: str
+    call_sid: str
+    lead_id: str
+    lead_info: dict
+    start_time: datetime
+    status: str
+
+def track_call(call_history, call_sid_to_id, call_id, call_info, active_calls=None):
+    """Record a call in call_history, evicting the oldest beyond MAX_CALL_HISTORY"""
+    with _calls_lock:
+        _track_call_locked(call_history, call_sid_to_id, call_id, call_info, active_calls)
+
+def track_call_once(call_history, call_sid_to_id, call_id, call_info, active_calls=None):
+    """Record a call unless it is already tracked, returning the tracked CallRec"""
+    with _calls_lock:
+        existing = call_history.get(call_id)
+        if existing is not None:
+            return existing
+        _track_call_locked(call_history, call_sid_to_id, call_id, call_info, active_calls)
+        return call_info
+
+def _track_call_locked(call_history, call_sid_to_id, call_id, call_info, active_calls=None):
+    """Record a call; the caller holds _calls_lock"""
+    call_history[call_id] = call_info
+    call_history.move_to_end(call_id)
+    
+    call_sid = call_info.call_sid
+    if call_sid and call_sid_to_id is not None:
+        call_sid_to_id[call_sid] = call_id
+    
+    while len(call_history) > MAX_CALL_HISTORY:
+        evicted_id, evicted = call_history.popitem(last=False)
+        if call_sid_to_id is not None:
+            call_sid_to_id.pop(evicted.call_sid, None)
+        # An evicted call gets no further status updates, so stop counting it as active
+        if active_calls is not None:
+            active_calls.discard(evicted_id)
+
+def set_call_status(call_history, call_id, status):
+    """Update a tracked call's status and mark it most recently used, returning the CallRec (None if untracked)"""
+    with _calls_lock:
+        call_info = call_history.get(call_id)
+        if call_info is not None:
+            call_info.status = status
+            call_history.move_to_end(call_id)
+        return call_info
+
+def forget_call(call_history, call_sid_to_id, call_id, call_sid=''):
+    """Drop a finished call and its CallSid index entries"""
+    with _calls_lock:
+        call_info = call_history.pop(call_id, None)
+        if call_info and call_info.call_sid:
+            call_sid_to_id.pop(call_info.call_sid, None)
+        if call_sid:
+            call_sid_to_id.pop(call_sid, None)
+
+def cached_dashboard():
+    """Get the cached /dashboard payload, or None if missing or older than DASHBOARD_CACHE_TTL"""
+    with _dash_lock:
+        if _DASH_CACHE['body'] is not None and time.monotonic() - _DASH_CACHE['ts'] < DASHBOARD_CACHE_TTL:
+            return _DASH_CACHE['body']
+    return None
+
+def store_dashboard(body):
+    """Cache a freshly built /dashboard payload"""
+    with _dash_lock:
+        _DASH_CACHE['body'] = body
+        _DASH_CACHE['ts'] = time.monotonic()
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard payload after a call record write"""
+    with _dash_lock:
+        _DASH_CACHE['ts'] = 0.0
@@ -5,18 +5,68 @@ Route handlers for Setter.AI web application
 Contains all the Flask route handlers for the dashboard and API endpoints.
 """
 
-import sqlite3
-import json
 from datetime import datetime
-from flask import jsonify, request, render_template
+from xml.sax.saxutils import escape, quoteattr
+from flask import Response, request, render_template
 import logging
+import orjson
+
+from ..utils.async_loop import run_async
+from ..utils.database import get_connection, release_connection, transaction
+from .calls import (CallRec, cached_dashboard, forget_call, invalidate_dashboard_cache,
+                    set_call_status, store_dashboard, track_call_once)
 
 logger = logging.getLogger(__name__)
 
+# TwiML for a conversational turn: say the AI response, then record the reply.
+# Filled with the XML-escaped, UTF-8 encoded response text and action URL
+TWIML_TEMPLATE = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say voice="alice">%s</Say>
+    <Record action=%s 
+            maxLength="30" 
+            playBeep="true" 
+            trim="trim-silence" />
+</Response>'''
+TWIML_HEADERS = {'Content-Type': 'application/xml; charset=utf-8'}
+
+# Call statuses after which Twilio sends no further conversation webhooks
+TERMINAL_STATUSES = frozenset({'completed', 'busy', 'failed', 'no-answer', 'canceled'})
+
+def _json(payload, status=200):
+    """Build a JSON response with orjson (faster than jsonify)"""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def _turn_twiml(ai_response, call_id):
+    """Render the TwiML for one conversational turn"""
+    return TWIML_TEMPLATE % (
+        escape(ai_response).encode('utf-8'),
+        quoteattr(f"/handle_response?call_id={call_id}").encode('utf-8')
+    )
+
 def register_routes(app, ai_logic, ghl_integration, twilio_integration, 
-                   active_calls, call_history, db_path):
+                   active_calls, call_history, call_sid_to_id, db_path):
     """Register all routes with the Flask app"""
     
+    @app.teardown_appcontext
+    def release_db_connection(exc):
+        """Return this request thread's connection to the pool"""
+        release_connection(db_path)
+    
+    # Static parts of /config and /health, computed once at startup
+    config_body = orjson.dumps({
+        'agent_name': ai_logic.config.get('agent_name', ''),
+        'company_name': ai_logic.config.get('company_name', ''),
+        'contact_person': ai_logic.config.get('contact_person', ''),
+        'check_interval_minutes': ghl_integration.config.get('check_interval_minutes', 10)
+    })
+    static_health = {
+        'status': 'healthy',
+        'ghl_configured': ghl_integration.is_configured(),
+        'twilio_configured': twilio_integration.is_configured(),
+        'ai_configured': ai_logic.is_configured()
+    }
+    
     @app.route('/', methods=['GET'])
     def dashboard_page():
         """Main dashboard page"""
@@ -26,27 +76,32 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
     def dashboard():
         """Dashboard API endpoint"""
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            body = cached_dashboard()
+            if body is not None:
+                return Response(body, mimetype='application/json')
             
-            # Get call statistics
-            cursor.execute('SELECT COUNT(*) FROM call_records')
-            total_calls = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM call_records WHERE status IN ("initiated", "ringing", "active")')
-            active_calls_count = cursor.fetchone()[0]
+            conn = get_connection(db_path)
+            cursor = conn.cursor()
             
-            cursor.execute('SELECT SUM(duration) FROM call_records WHERE duration > 0')
-            total_duration = cursor.fetchone()[0] or 0
-            minutes_spoken = round(total_duration / 60, 1)
+            # Get call statistics in a single pass over call_records
+            cursor.execute('''
+                SELECT
+                    COUNT(*),
+                    SUM(CASE WHEN status IN ('initiated', 'ringing', 'active') THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN duration > 0 THEN duration ELSE 0 END),
+                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN meeting_email IS NOT NULL THEN 1 ELSE 0 END)
+                FROM call_records
+            ''')
+            total_calls, active_calls_count, total_duration, completed_calls, meetings_scheduled = cursor.fetchone()
             
-            cursor.execute('SELECT COUNT(*) FROM call_records WHERE status = "completed"')
-            completed_calls = cursor.fetchone()[0]
+            # SUM over an empty table is NULL
+            active_calls_count = active_calls_count or 0
+            completed_calls = completed_calls or 0
+            meetings_scheduled = meetings_scheduled or 0
+            minutes_spoken = round((total_duration or 0) / 60, 1)
             success_rate = round((completed_calls / total_calls * 100) if total_calls > 0 else 0, 1)
             
-            cursor.execute('SELECT COUNT(*) FROM call_records WHERE meeting_email IS NOT NULL AND meeting_email != ""')
-            meetings_scheduled = cursor.fetchone()[0]
-            
             # Get recent calls
             cursor.execute('''
                 SELECT call_id, lead_name, status, call_start_time, duration, call_sid
@@ -67,9 +122,9 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                 }
                 recent_calls.append(call_data)
             
-            conn.close()
+            cursor.close()
             
-            return jsonify({
+            body = orjson.dumps({
                 'total_calls': total_calls,
                 'active_calls': active_calls_count,
                 'minutes_spoken': minutes_spoken,
@@ -77,16 +132,19 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                 'meetings_scheduled': meetings_scheduled,
                 'recent_calls': recent_calls
             })
+            store_dashboard(body)
+            
+            return Response(body, mimetype='application/json')
             
         except Exception as e:
             logger.error(f"Error loading dashboard: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/call_records/<call_id>', methods=['GET'])
     def get_call_record(call_id):
         """Get call record details"""
         try:
-            conn = sqlite3.connect(db_path)
+            conn = get_connection(db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -96,13 +154,13 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             ''', (call_id,))
             
             row = cursor.fetchone()
-            conn.close()
+            cursor.close()
             
             if row:
                 # Get conversation from AI logic
                 ai_conversation = ai_logic.get_conversation_history(call_id)
                 
-                return jsonify({
+                return _json({
                     'call_id': call_id,
                     'lead_name': row[0],
                     'status': row[1],
@@ -113,48 +171,51 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                     'call_start_time': row[5]
                 })
             else:
-                return jsonify({'error': 'Call not found'}), 404
+                return _json({'error': 'Call not found'}, 404)
                 
         except Exception as e:
             logger.error(f"Error getting call record: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/recording/<call_id>', methods=['GET'])
     def get_recording_url(call_id):
         """Get recording URL for a call"""
         try:
-            conn = sqlite3.connect(db_path)
+            conn = get_connection(db_path)
             cursor = conn.cursor()
             
             cursor.execute('SELECT recording_url FROM call_records WHERE call_id = ?', (call_id,))
             row = cursor.fetchone()
-            conn.close()
+            cursor.close()
             
             if row and row[0]:
-                recording_sid = row[0]
                 # Generate Twilio recording URL
-                recording_url = f"https://api.twilio.com/2010-04-01/Accounts/{twilio_integration.account_sid}/Recordings/{recording_sid}/Media"
-                return jsonify({'recording_url': recording_url})
+                return _json({'recording_url': twilio_integration.recording_media_url(row[0])})
             else:
-                return jsonify({'error': 'No recording available'}), 404
+                return _json({'error': 'No recording available'}, 404)
                 
         except Exception as e:
             logger.error(f"Error getting recording URL: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/recording_media/<recording_sid>', methods=['GET'])
     def serve_recording_media(recording_sid):
         """Serve recording media file"""
         try:
-            # Get recording media from Twilio
-            recording_url = f"https://api.twilio.com/2010-04-01/Accounts/{twilio_integration.account_sid}/Recordings/{recording_sid}/Media"
+            # Stream recording media from Twilio chunk by chunk
+            media = twilio_integration.serve_recording_media(recording_sid)
+            if not media:
+                return _json({'error': 'Recording not found'}, 404)
             
-            # For now, return the URL - in production you'd stream the audio
-            return jsonify({'recording_url': recording_url})
+            return Response(
+                media['content'],
+                mimetype=media['mimetype'],
+                headers={'Content-Disposition': f"inline; filename={media['filename']}"}
+            )
             
         except Exception as e:
             logger.error(f"Error serving recording media: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/leads', methods=['GET'])
     def get_leads():
@@ -163,14 +224,14 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             leads = ghl_integration.get_leads()
             check_interval = ghl_integration.config.get('check_interval_minutes', 10)
             
-            return jsonify({
+            return _json({
                 'leads': leads,
                 'check_interval_minutes': check_interval
             })
             
         except Exception as e:
             logger.error(f"Error getting leads: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/make_call', methods=['POST'])
     def make_call_endpoint():
@@ -180,26 +241,26 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             lead_id = data.get('lead_id')
             
             if not lead_id:
-                return jsonify({'error': 'Lead ID required'}), 400
+                return _json({'error': 'Lead ID required'}, 400)
             
             # Get lead from GHL
             lead = ghl_integration.get_lead_by_id(lead_id)
             if not lead:
-                return jsonify({'error': 'Lead not found'}), 404
+                return _json({'error': 'Lead not found'}, 404)
             
             # Make call
             success = make_call(lead, ai_logic, ghl_integration, 
                               twilio_integration, active_calls, 
-                              call_history, db_path)
+                              call_history, db_path, call_sid_to_id)
             
             if success:
-                return jsonify({'success': True, 'message': 'Call initiated'})
+                return _json({'success': True, 'message': 'Call initiated'})
             else:
-                return jsonify({'error': 'Failed to initiate call'}), 500
+                return _json({'error': 'Failed to initiate call'}, 500)
                 
         except Exception as e:
             logger.error(f"Error making call: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/test_call', methods=['POST'])
     def test_call():
@@ -209,7 +270,7 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             phone_number = data.get('phone_number')
             
             if not phone_number:
-                return jsonify({'error': 'Phone number required'}), 400
+                return _json({'error': 'Phone number required'}, 400)
             
             # Create test lead
             test_lead = {
@@ -222,21 +283,21 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             # Make test call
             success = make_call(test_lead, ai_logic, ghl_integration, 
                               twilio_integration, active_calls, 
-                              call_history, db_path)
+                              call_history, db_path, call_sid_to_id)
             
             if success:
-                return jsonify({'success': True, 'message': 'Test call initiated'})
+                return _json({'success': True, 'message': 'Test call initiated'})
             else:
-                return jsonify({'error': 'Failed to initiate test call'}), 500
+                return _json({'error': 'Failed to initiate test call'}, 500)
                 
         except Exception as e:
             logger.error(f"Error making test call: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/test_webhook', methods=['GET', 'POST'])
     def test_webhook():
         """Test webhook endpoint"""
-        return jsonify({
+        return _json({
             'status': 'success',
             'message': 'Webhook endpoint is working',
             'method': request.method,
@@ -251,40 +312,33 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             lead_id = request.args.get('lead_id', '')
             
             if not call_id:
-                return jsonify({'error': 'Call ID required'}), 400
+                return _json({'error': 'Call ID required'}, 400)
             
             # Get call info from memory or create if not exists
-            if call_id not in call_history:
-                call_info = {
-                    'call_id': call_id,
-                    'lead_id': lead_id,
-                    'start_time': datetime.now(),
-                    'status': 'initiated'
-                }
-                call_history[call_id] = call_info
+            call_info = call_history.get(call_id)
+            if call_info is None:
+                call_info = track_call_once(call_history, call_sid_to_id, call_id, CallRec(
+                    call_id=call_id,
+                    call_sid='',
+                    lead_id=lead_id,
+                    lead_info={},
+                    start_time=datetime.now(),
+                    status='initiated'
+                ), active_calls)
             
             # Generate AI response
-            lead_info = call_history[call_id].get('lead_info', {})
-            ai_response = ai_logic.generate_response(lead_info, "", call_id)
+            lead_info = call_info.lead_info
+            ai_response = run_async(ai_logic.generate_response(lead_info, "", call_id))
             
             # Store AI response in conversation history
             ai_logic.store_ai_response(call_id, ai_response)
             
             # Return TwiML response
-            twiml_response = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say voice="alice">{ai_response}</Say>
-    <Record action="/handle_response?call_id={call_id}" 
-            maxLength="30" 
-            playBeep="true" 
-            trim="trim-silence" />
-</Response>'''
-            
-            return twiml_response, 200, {'Content-Type': 'text/xml'}
+            return _turn_twiml(ai_response, call_id), 200, TWIML_HEADERS
             
         except Exception as e:
             logger.error(f"Error handling call: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/handle_response', methods=['POST'])
     def handle_call_response():
@@ -293,7 +347,7 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             call_id = request.args.get('call_id', '')
             
             if not call_id:
-                return jsonify({'error': 'Call ID required'}), 400
+                return _json({'error': 'Call ID required'}, 400)
             
             # Get user response
             user_response = request.form.get('SpeechResult', '')
@@ -304,27 +358,19 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             ai_logic.store_user_response(call_id, user_response)
             
             # Generate AI response
-            lead_info = call_history.get(call_id, {}).get('lead_info', {})
-            ai_response = ai_logic.generate_response(lead_info, user_response, call_id)
+            call_info = call_history.get(call_id)
+            lead_info = call_info.lead_info if call_info else {}
+            ai_response = run_async(ai_logic.generate_response(lead_info, user_response, call_id))
             
             # Store AI response
             ai_logic.store_ai_response(call_id, ai_response)
             
             # Return TwiML response
-            twiml_response = f'''<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say voice="alice">{ai_response}</Say>
-    <Record action="/handle_response?call_id={call_id}" 
-            maxLength="30" 
-            playBeep="true" 
-            trim="trim-silence" />
-</Response>'''
-            
-            return twiml_response, 200, {'Content-Type': 'text/xml'}
+            return _turn_twiml(ai_response, call_id), 200, TWIML_HEADERS
             
         except Exception as e:
             logger.error(f"Error handling response: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/call_status', methods=['POST'])
     def handle_call_status():
@@ -338,25 +384,22 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             
             # Find call_id if not in URL
             if not call_id and call_sid:
-                for cid, info in call_history.items():
-                    if info.get('call_sid') == call_sid:
-                        call_id = cid
-                        break
+                call_id = call_sid_to_id.get(call_sid, '')
             
             if not call_id:
                 # Try to find in database
-                conn = sqlite3.connect(db_path)
+                conn = get_connection(db_path)
                 cursor = conn.cursor()
                 cursor.execute('SELECT call_id FROM call_records WHERE call_sid = ?', (call_sid,))
                 row = cursor.fetchone()
-                conn.close()
+                cursor.close()
                 
                 if row:
                     call_id = row[0]
             
             if not call_id:
                 logger.error(f"Could not find call_id for call_sid: {call_sid}")
-                return jsonify({'error': 'Call ID not found'}), 400
+                return _json({'error': 'Call ID not found'}, 400)
             
             # Update call status
             status_mapping = {
@@ -373,13 +416,11 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             
             mapped_status = status_mapping.get(call_status, call_status)
             
-            # Update call history
-            if call_id in call_history:
-                call_history[call_id]['status'] = mapped_status
-                
-                if mapped_status in ['completed', 'busy', 'failed', 'no-answer', 'canceled']:
-                    if call_id in active_calls:
-                        del active_calls[call_id]
+            # Update call history; a finished call is no longer active even if
+            # it has already been evicted from call_history
+            set_call_status(call_history, call_id, mapped_status)
+            if mapped_status in TERMINAL_STATUSES:
+                active_calls.discard(call_id)
             
             # Extract recording_sid from full URL if needed
             if recording_url and not recording_sid:
@@ -387,64 +428,50 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                 if '/Recordings/' in recording_url:
                     recording_sid = recording_url.split('/Recordings/')[-1].split('/')[0]
             
-            # Save to database
-            call_result = {
-                'status': mapped_status,
-                'call_sid': call_sid,
-                'conversation_data': '',
-                'recording_url': recording_sid or '',
-                'duration': 0
-            }
-            
-            save_call_record(call_id, call_history.get(call_id, {}), call_result, db_path)
-            
-            # Direct database update for immediate status change
+            # Single in-place update; the row itself is inserted by make_call.
+            # Keep the stored call_sid/recording when this callback doesn't carry one
             try:
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE call_records 
-                    SET status = ?, recording_url = ?
-                    WHERE call_id = ?
-                ''', (mapped_status, recording_sid or '', call_id))
-                conn.commit()
-                conn.close()
+                with transaction(db_path) as conn:
+                    conn.execute('''
+                        UPDATE call_records 
+                        SET status = ?,
+                            call_sid = CASE WHEN ? <> '' THEN ? ELSE call_sid END,
+                            recording_url = CASE WHEN ? <> '' THEN ? ELSE recording_url END
+                        WHERE call_id = ?
+                    ''', (mapped_status, call_sid, call_sid, recording_sid or '', recording_sid or '', call_id))
+                invalidate_dashboard_cache()
             except Exception as e:
                 logger.error(f"Error updating call status in database: {str(e)}")
             
-            return jsonify({'success': True, 'status': mapped_status})
+            # Finished calls live on in call_records only; drop the in-memory state
+            if mapped_status in TERMINAL_STATUSES:
+                forget_call(call_history, call_sid_to_id, call_id, call_sid)
+            
+            return _json({'success': True, 'status': mapped_status})
             
         except Exception as e:
             logger.error(f"Error handling call status: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/health', methods=['GET'])
     def health_check():
         """Health check endpoint"""
-        return jsonify({
-            'status': 'healthy',
+        return _json({
+            **static_health,
             'timestamp': datetime.now().isoformat(),
-            'active_calls': len(active_calls),
-            'ghl_configured': ghl_integration.is_configured(),
-            'twilio_configured': twilio_integration.is_configured(),
-            'ai_configured': ai_logic.is_configured()
+            'active_calls': len(active_calls)
         })
     
     @app.route('/config', methods=['GET'])
     def get_config():
         """Get configuration for frontend"""
-        return jsonify({
-            'agent_name': ai_logic.config.get('agent_name', ''),
-            'company_name': ai_logic.config.get('company_name', ''),
-            'contact_person': ai_logic.config.get('contact_person', ''),
-            'check_interval_minutes': ghl_integration.config.get('check_interval_minutes', 10)
-        })
+        return Response(config_body, mimetype='application/json')
     
     @app.route('/debug_conversation/<call_id>', methods=['GET'])
     def debug_conversation(call_id):
         """Debug endpoint to check conversation data"""
         try:
-            conn = sqlite3.connect(db_path)
+            conn = get_connection(db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -453,7 +480,7 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             ''', (call_id,))
             
             row = cursor.fetchone()
-            conn.close()
+            cursor.close()
             
             if row:
                 conversation_data = row[0]
@@ -463,7 +490,7 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                 # Also get from AI logic
                 ai_conversation = ai_logic.get_conversation_history(call_id)
                 
-                return jsonify({
+                return _json({
                     'call_id': call_id,
                     'lead_name': lead_name,
                     'status': status,
@@ -473,17 +500,17 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                     'database_conversation_length': len(conversation_data) if conversation_data else 0
                 })
             else:
-                return jsonify({'error': 'Call not found'}), 404
+                return _json({'error': 'Call not found'}, 404)
                 
         except Exception as e:
             logger.error(f"Error debugging conversation: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
     
     @app.route('/debug_all_calls', methods=['GET'])
     def debug_all_calls():
         """Debug endpoint to check all calls and their conversation data"""
         try:
-            conn = sqlite3.connect(db_path)
+            conn = get_connection(db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -494,7 +521,7 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
             ''')
             
             rows = cursor.fetchall()
-            conn.close()
+            cursor.close()
             
             calls_data = []
             for row in rows:
@@ -512,11 +539,11 @@ def register_routes(app, ai_logic, ghl_integration, twilio_integration,
                     'duration': row[5]
                 })
             
-            return jsonify({
+            return _json({
                 'total_calls': len(calls_data),
                 'calls': calls_data
             })
             
         except Exception as e:
             logger.error(f"Error debugging all calls: {str(e)}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
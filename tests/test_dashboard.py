@@ -10,13 +10,14 @@ import json
 def test_dashboard():
     """Test dashboard endpoints"""
     base_url = "http://localhost:5000"
+    session = requests.Session()  # one keep-alive connection for all checks
     
     print("🧪 Testing Dashboard Endpoints")
     print("=" * 40)
     
     # Test dashboard data
     try:
-        response = requests.get(f"{base_url}/dashboard")
+        response = session.get(f"{base_url}/dashboard")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Dashboard data: {len(data.get('recent_calls', []))} recent calls")
@@ -29,7 +30,7 @@ def test_dashboard():
     
     # Test leads endpoint
     try:
-        response = requests.get(f"{base_url}/leads")
+        response = session.get(f"{base_url}/leads")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Leads data: {len(data.get('leads', []))} leads available")
@@ -41,7 +42,7 @@ def test_dashboard():
     
     # Test config endpoint
     try:
-        response = requests.get(f"{base_url}/config")
+        response = session.get(f"{base_url}/config")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Config loaded: {data.get('agent_name', 'Unknown')}")
@@ -49,6 +50,8 @@ def test_dashboard():
             print(f"❌ Config error: {response.status_code}")
     except Exception as e:
         print(f"❌ Config error: {str(e)}")
+    
+    session.close()
 
 if __name__ == "__main__":
     test_dashboard() 
\ No newline at end of file
@@ -120,7 +120,7 @@ def generate_ai_response(lead_info, context="", call_id=""):
     
     try:
         # Call OpenAI API
-        response = openai.ChatCompletion.create(
+        response = openai.chat.completions.create(
             model=config['ai_settings']['model'],
             messages=messages,
             max_tokens=config['ai_settings']['max_tokens'],
@@ -185,6 +185,30 @@ def test_conversation_flow():
     print(f"\n✅ Conversation completed successfully!")
     print(f"📅 Meeting scheduled for tomorrow at 3:00 PM MST")
 
+def test_meeting_time_extraction():
+    """Test meeting time extraction from an agent confirmation ending in a period"""
+    import sys
+    sys.path.append('..')
+    from src.setter_ai.core.ai_logic import AILogic
+
+    ai_logic = AILogic({})
+
+    confirmations = [
+        ("Great, Ryan will call you tomorrow at 3 pm.", '3:00 PM MST'),
+        ("Ryan will call at 3 pm.", '3:00 PM MST'),
+        ("Perfect, see you at 3 p.m.", '3:00 PM MST'),
+        ("Ryan will call you tomorrow.", 'Tomorrow (Time TBD)')
+    ]
+
+    for i, (confirmation, expected) in enumerate(confirmations):
+        call_id = f"test_meeting_{i}"
+        ai_logic.store_user_response(call_id, "Yes, that works.")
+        ai_logic._append_message(call_id, ai_logic.agent_name, confirmation)
+
+        meeting_time = ai_logic.summarize_call(call_id)['meeting_time']
+        print(f"📅 {confirmation!r} -> {meeting_time}")
+        assert meeting_time == expected, f"expected {expected!r}, got {meeting_time!r}"
+
 def main():
     """Main test function"""
     config = load_config()